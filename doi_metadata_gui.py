@@ -3,25 +3,51 @@
 # Enhanced to work with both light and dark Windows themes
 
 import io
-import difflib
+import os
+import functools
+import hashlib
+import logging
 import re
+import tempfile
+import threading
+import time
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 import typing as t
 
+import numpy as np
+import openpyxl
 import pandas as pd
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import streamlit as st
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from rapidfuzz import fuzz, process
 
-# ----- Optional but fast fuzzy -----
+# ----- Optional but fast Excel reader (Rust) -----
 try:
-    from rapidfuzz import fuzz, process  # type: ignore
-    _USE_RAPIDFUZZ = True
+    import python_calamine  # type: ignore  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
 except Exception:
-    _USE_RAPIDFUZZ = False
+    _EXCEL_ENGINE = "openpyxl"
+
+# ----- Optional but fast JSON decoding -----
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except Exception:
+    import json
+    _json_loads = json.loads
+
+# ----- Optional persistent metadata cache -----
+try:
+    import diskcache  # type: ignore
+    _USE_DISKCACHE = True
+except Exception:
+    _USE_DISKCACHE = False
 
 # --------------------------------------------------------------------
 # Built-in data sources (UNCHANGED)
@@ -35,6 +61,135 @@ SCOPUS_FALLBACK_URL = (
     "?rlkey=kyieyvc0b08vgo0asxhe0j061&st=ooszzvmx&dl=1"
 )
 
+_log = logging.getLogger(__name__)
+
+# On-disk state (metadata cache) survives restarts and is shared by workers
+_CACHE_DIR = os.environ.get("DOI_NAVIGATOR_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "doi_navigator")
+_METADATA_TTL = 60*60*24*7
+_TABLE_TTL = 60*60*12
+
+@st.cache_resource(show_spinner=False)
+def _metadata_store():
+    if not _USE_DISKCACHE:
+        return None
+    return diskcache.Cache(os.path.join(_CACHE_DIR, "metadata"))
+
+def _store_get(doi: str) -> t.Optional[dict]:
+    store = _metadata_store()
+    return store.get(doi.lower()) if store is not None else None
+
+def _store_put(doi: str, data: dict) -> None:
+    store = _metadata_store()
+    if store is not None:
+        store.set(doi.lower(), data, expire=_METADATA_TTL)
+
+# Circuit breaker for a degraded upstream: after `threshold` failures inside
+# `window` seconds, calls are refused for `cooldown` seconds so lookups fall
+# straight through to the next source instead of waiting out every retry.
+class _CircuitBreaker:
+    def __init__(self, threshold: int = 5, window: float = 30.0, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._failures: list[float] = []
+        self._opened_at: t.Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            return self._opened_at is None or time.monotonic() - self._opened_at >= self.cooldown
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._failures = [f for f in self._failures if now - f < self.window]
+            self._failures.append(now)
+            if len(self._failures) >= self.threshold:
+                self._opened_at = now
+
+@st.cache_resource(show_spinner=False)
+def _crossref_breaker() -> _CircuitBreaker:
+    return _CircuitBreaker()
+
+# One pooled session for the whole process: every worker thread and rerun
+# reuses the same keep-alive connections instead of opening a fresh pool
+# (and TLS handshake) per request.
+@st.cache_resource(show_spinner=False)
+def _get_session() -> requests.Session:
+    s = requests.Session()
+    # Short ladder (0.2s doubling, capped at 2s): one flaky DOI shouldn't
+    # stall the batch; the circuit breaker handles a Crossref that stays down
+    retries = Retry(
+        total=3,
+        backoff_factor=0.2,
+        backoff_max=2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET"]),
+    )
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=64, pool_maxsize=64)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"User-Agent": "DOI-Navigator/1.1 (mailto:your.email@domain)"})
+    return s
+
+# DOIs are case-insensitive; lower-casing (as Crossref does) gives every
+# spelling of the same DOI one dedup/cache key
+_DOI_PREFIXES = (
+    "https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/",
+    "doi:", "doi ",
+)
+
+def normalize_doi_input(s: str) -> str:
+    s = s.strip().lower()
+    for prefix in _DOI_PREFIXES:
+        if s.startswith(prefix):
+            s = s.removeprefix(prefix)
+            break
+    return s.strip()
+
+# Shape check only (directory indicator "10.", registrant code, suffix), so
+# pasted junk is reported up front instead of costing a round-trip
+_DOI_RE = re.compile(r"10\.\d{4,9}/\S+")
+
+# A bare single-letter token in a given name is an initial: "J K" -> "J. K."
+_INITIAL_RE = re.compile(r"(?<!\S)([^\W\d_])(?!\S)")
+
+# The stylesheet is a static asset read once per process. It still has to be
+# emitted on every rerun (Streamlit drops elements a run doesn't re-create),
+# but the string is built once and Streamlit's message cache spares the
+# browser repeat payloads of identical large elements.
+_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css")
+# Linked rather than @import-ed from the sheet, so the font request starts as
+# soon as the markup lands instead of after the stylesheet is parsed
+_FONTS_URL = "https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700;800&display=swap"
+
+@st.cache_resource(show_spinner=False)
+def _app_css() -> str:
+    with open(_CSS_PATH, encoding="utf-8") as f:
+        css = f.read()
+    return (
+        '<link rel="preconnect" href="https://fonts.googleapis.com">'
+        '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+        f'<link rel="stylesheet" href="{_FONTS_URL}">'
+        f"<style>\n{css}</style>"
+    )
+
+# Journal-name normalization is shared by the readers and the matcher; the
+# same titles repeat heavily across JCR, Scopus and a DOI batch, so memoize it.
+_PUNCT_TO_SPACE = str.maketrans({ch: " " for ch in ",.:;()[]"})
+
+@functools.lru_cache(maxsize=200_000)
+def normalize_journal(s: str) -> str:
+    if not isinstance(s, str):
+        return ""
+    s = s.lower().replace("&", "and").translate(_PUNCT_TO_SPACE)
+    return " ".join(s.split())
+
 def run_original_app():
     """Main app with adaptive theme support"""
     
@@ -43,634 +198,8 @@ def run_original_app():
     # --------------------------------------------------------------------
     st.set_page_config(page_title="DOI Navigator", layout="wide", page_icon="🔍", initial_sidebar_state="expanded")
 
-    # Enhanced CSS with adaptive light/dark theme support
-    st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700;800;900&display=swap');
-
-/* CSS Variables for Adaptive Theme */
-:root {
-    /* Light theme default */
-    --primary-bg: #ffffff;
-    --secondary-bg: #f8f9fa;
-    --tertiary-bg: #e9ecef;
-    --card-bg: rgba(255, 255, 255, 0.95);
-    --card-bg-alt: rgba(248, 249, 250, 0.95);
-    --text-primary: #212529;
-    --text-secondary: #6c757d;
-    --text-muted: #868e96;
-    --border-color: rgba(0, 0, 0, 0.125);
-    --border-light: rgba(0, 0, 0, 0.06);
-    --shadow-light: rgba(0, 0, 0, 0.08);
-    --shadow-medium: rgba(0, 0, 0, 0.12);
-    --shadow-heavy: rgba(0, 0, 0, 0.16);
-    --input-bg: rgba(255, 255, 255, 0.9);
-    --input-border: rgba(94, 114, 228, 0.25);
-    --sidebar-bg: rgba(248, 249, 250, 0.95);
-    --gradient-bg: linear-gradient(135deg, #ffffff 0%, #f8f9fa 50%, #e9ecef 100%);
-}
-
-/* Dark theme overrides */
-@media (prefers-color-scheme: dark) {
-    :root {
-        --primary-bg: #1a1a2e;
-        --secondary-bg: #16213e;
-        --tertiary-bg: #0f3460;
-        --card-bg: rgba(15, 23, 42, 0.95);
-        --card-bg-alt: rgba(22, 33, 62, 0.95);
-        --text-primary: #e2e8f0;
-        --text-secondary: #94a3b8;
-        --text-muted: #64748b;
-        --border-color: rgba(255, 255, 255, 0.1);
-        --border-light: rgba(255, 255, 255, 0.05);
-        --shadow-light: rgba(0, 0, 0, 0.2);
-        --shadow-medium: rgba(0, 0, 0, 0.3);
-        --shadow-heavy: rgba(0, 0, 0, 0.4);
-        --input-bg: rgba(15, 23, 42, 0.8);
-        --input-border: rgba(94, 114, 228, 0.4);
-        --sidebar-bg: rgba(15, 23, 42, 0.95);
-        --gradient-bg: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-    }
-}
-
-/* Global Styles */
-.stApp {
-    background: var(--gradient-bg);
-    font-family: 'Poppins', sans-serif;
-    color: var(--text-primary);
-}
-
-/* Animated Background - Subtle */
-.stApp::before {
-    content: '';
-    position: fixed;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 100%;
-    background-image: 
-        radial-gradient(circle at 20% 80%, rgba(233, 69, 96, 0.03) 0%, transparent 50%),
-        radial-gradient(circle at 80% 20%, rgba(52, 211, 153, 0.03) 0%, transparent 50%),
-        radial-gradient(circle at 40% 40%, rgba(94, 114, 228, 0.03) 0%, transparent 50%);
-    animation: gradientShift 25s ease infinite;
-    pointer-events: none;
-    z-index: -1;
-}
-
-@keyframes gradientShift {
-    0%, 100% { transform: translate(0, 0) rotate(0deg); }
-    33% { transform: translate(-15px, -15px) rotate(120deg); }
-    66% { transform: translate(15px, -10px) rotate(240deg); }
-}
-
-/* Bouncing Balls Animation - Adaptive colors */
-.bouncing-balls {
-    position: absolute;
-    width: 100%;
-    height: 100px;
-    top: 50%;
-    left: 50%;
-    transform: translate(-50%, -50%);
-    pointer-events: none;
-    z-index: 1;
-}
-
-.ball {
-    position: absolute;
-    width: 20px;
-    height: 20px;
-    border-radius: 50%;
-    animation: bounce 2s infinite ease-in-out;
-}
-
-.ball:nth-child(1) {
-    left: 20%;
-    background: linear-gradient(135deg, #e94560, #ff6b6b);
-    animation-delay: 0s;
-    box-shadow: 0 0 20px rgba(233, 69, 96, 0.4);
-}
-
-.ball:nth-child(2) {
-    left: 35%;
-    background: linear-gradient(135deg, #34d399, #10b981);
-    animation-delay: 0.2s;
-    box-shadow: 0 0 20px rgba(52, 211, 153, 0.4);
-}
-
-.ball:nth-child(3) {
-    left: 50%;
-    background: linear-gradient(135deg, #5e72e4, #667eea);
-    animation-delay: 0.4s;
-    box-shadow: 0 0 20px rgba(94, 114, 228, 0.4);
-}
-
-.ball:nth-child(4) {
-    left: 65%;
-    background: linear-gradient(135deg, #f59e0b, #fbbf24);
-    animation-delay: 0.6s;
-    box-shadow: 0 0 20px rgba(245, 158, 11, 0.4);
-}
-
-.ball:nth-child(5) {
-    left: 80%;
-    background: linear-gradient(135deg, #8b5cf6, #a78bfa);
-    animation-delay: 0.8s;
-    box-shadow: 0 0 20px rgba(139, 92, 246, 0.4);
-}
-
-@keyframes bounce {
-    0%, 100% {
-        transform: translateY(0) scale(1);
-    }
-    50% {
-        transform: translateY(-30px) scale(1.1);
-    }
-}
-
-/* Header Styles - Adaptive */
-.hero-section {
-    background: var(--card-bg);
-    border: 1px solid var(--border-light);
-    border-radius: 24px;
-    padding: 40px;
-    margin: -20px -50px 30px -50px;
-    backdrop-filter: blur(20px);
-    box-shadow: 
-        0 10px 40px var(--shadow-light),
-        inset 0 1px 0 var(--border-light);
-    animation: slideDown 0.6s ease-out;
-    position: relative;
-    overflow: hidden;  /* Changed from visible to hidden */
-    min-height: 200px;  /* Added minimum height */
-}
-
-/* Particle Canvas */
-#particleCanvas {
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 100%;
-    pointer-events: none;
-    opacity: 0.6;
-}
-
-@keyframes slideDown {
-    from { opacity: 0; transform: translateY(-30px); }
-    to { opacity: 1; transform: translateY(0); }
-}
-/* Geometric Background Pattern */
-.geometric-bg {
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 100%;
-    overflow: hidden;
-    opacity: 0.1;
-}
-
-.geo-shape {
-    position: absolute;
-    border: 2px solid;
-    border-radius: 30% 70% 70% 30% / 30% 30% 70% 70%;
-    animation: morphShape 15s ease-in-out infinite;
-}
-
-.geo-shape-1 {
-    width: 300px;
-    height: 300px;
-    top: -100px;
-    left: -100px;
-    border-color: #e94560;
-    animation-delay: 0s;
-}
-
-.geo-shape-2 {
-    width: 200px;
-    height: 200px;
-    top: 50%;
-    right: -50px;
-    border-color: #34d399;
-    animation-delay: 3s;
-}
-
-.geo-shape-3 {
-    width: 150px;
-    height: 150px;
-    bottom: -50px;
-    left: 20%;
-    border-color: #5e72e4;
-    animation-delay: 6s;
-}
-
-.geo-shape-4 {
-    width: 250px;
-    height: 250px;
-    top: 20%;
-    left: 40%;
-    border-color: #f59e0b;
-    animation-delay: 9s;
-}
-
-.geo-shape-5 {
-    width: 180px;
-    height: 180px;
-    bottom: 10%;
-    right: 20%;
-    border-color: #8b5cf6;
-    animation-delay: 12s;
-}
-
-.geo-shape-6 {
-    width: 220px;
-    height: 220px;
-    top: -50px;
-    right: 30%;
-    border-color: #10b981;
-    animation-delay: 15s;
-}
-
-@keyframes morphShape {
-    0%, 100% {
-        border-radius: 30% 70% 70% 30% / 30% 30% 70% 70%;
-        transform: rotate(0deg) scale(1);
-    }
-    25% {
-        border-radius: 70% 30% 30% 70% / 70% 70% 30% 30%;
-        transform: rotate(90deg) scale(1.1);
-    }
-    50% {
-        border-radius: 30% 70% 70% 30% / 70% 30% 30% 70%;
-        transform: rotate(180deg) scale(0.9);
-    }
-    75% {
-        border-radius: 70% 30% 30% 70% / 30% 70% 70% 30%;
-        transform: rotate(270deg) scale(1.05);
-    }
-}
-
-/* Floating Dots Animation */
-.floating-dots {
-    position: absolute;
-    width: 100%;
-    height: 100%;
-    overflow: hidden;
-}
-
-.floating-dots span {
-    position: absolute;
-    display: block;
-    width: 20px;
-    height: 20px;
-    background: linear-gradient(135deg, #5e72e4, #e94560);
-    border-radius: 50%;
-    opacity: 0.1;
-    animation: floatUp 15s linear infinite;
-}
-
-.floating-dots span:nth-child(1) { left: 5%; animation-delay: 0s; width: 15px; height: 15px; }
-.floating-dots span:nth-child(2) { left: 15%; animation-delay: 1s; width: 12px; height: 12px; }
-.floating-dots span:nth-child(3) { left: 25%; animation-delay: 2s; width: 18px; height: 18px; }
-.floating-dots span:nth-child(4) { left: 35%; animation-delay: 3s; width: 10px; height: 10px; }
-.floating-dots span:nth-child(5) { left: 45%; animation-delay: 4s; width: 22px; height: 22px; }
-.floating-dots span:nth-child(6) { left: 55%; animation-delay: 5s; width: 14px; height: 14px; }
-.floating-dots span:nth-child(7) { left: 65%; animation-delay: 6s; width: 16px; height: 16px; }
-.floating-dots span:nth-child(8) { left: 75%; animation-delay: 7s; width: 20px; height: 20px; }
-.floating-dots span:nth-child(9) { left: 85%; animation-delay: 8s; width: 11px; height: 11px; }
-.floating-dots span:nth-child(10) { left: 95%; animation-delay: 9s; width: 25px; height: 25px; }
-.floating-dots span:nth-child(11) { left: 10%; animation-delay: 10s; width: 13px; height: 13px; }
-.floating-dots span:nth-child(12) { left: 30%; animation-delay: 11s; width: 17px; height: 17px; }
-.floating-dots span:nth-child(13) { left: 50%; animation-delay: 12s; width: 19px; height: 19px; }
-.floating-dots span:nth-child(14) { left: 70%; animation-delay: 13s; width: 15px; height: 15px; }
-.floating-dots span:nth-child(15) { left: 90%; animation-delay: 14s; width: 21px; height: 21px; }
-
-@keyframes floatUp {
-    0% {
-        bottom: -100px;
-        transform: translateX(0);
-    }
-    25% {
-        transform: translateX(-30px);
-    }
-    50% {
-        transform: translateX(30px);
-    }
-    75% {
-        transform: translateX(-15px);
-    }
-    100% {
-        bottom: calc(100% + 100px);
-        transform: translateX(0);
-    }
-}
-
-.main-title {
-    font-size: 56px;
-    font-weight: 800;
-    background: linear-gradient(135deg, #e94560 0%, #34d399 25%, #5e72e4 50%, #f59e0b 75%, #8b5cf6 100%);
-    background-size: 400% 400%;
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    letter-spacing: -1px;
-    margin: 0;
-    animation: gradientFlow 10s ease infinite;
-    text-align: center;
-    position: relative;
-    z-index: 2;
-}
-
-@keyframes gradientFlow {
-    0%, 100% { background-position: 0% 50%; }
-    50% { background-position: 100% 50%; }
-}
-
-.subtitle {
-    color: var(--text-secondary);
-    font-size: 18px;
-    font-weight: 400;
-    text-align: center;
-    margin-top: 10px;
-    opacity: 0;
-    animation: fadeInUp 0.8s ease-out 0.3s forwards;
-}
-
-@keyframes fadeInUp {
-    to { opacity: 1; transform: translateY(0); }
-    from { opacity: 0; transform: translateY(10px); }
-}
-
-/* Input Styles - Adaptive */
-.stTextArea textarea, .stTextInput input {
-    background: var(--input-bg) !important;
-    border: 2px solid var(--input-border) !important;
-    border-radius: 12px !important;
-    color: var(--text-primary) !important;
-    font-size: 15px !important;
-    padding: 12px 16px !important;
-    transition: all 0.3s ease !important;
-    backdrop-filter: blur(10px) !important;
-}
-
-.stTextArea textarea::placeholder, .stTextInput input::placeholder {
-    color: var(--text-secondary) !important;
-    opacity: 0.7 !important;
-}
-
-.stTextArea textarea:focus, .stTextInput input:focus {
-    border-color: rgba(94, 114, 228, 0.6) !important;
-    box-shadow: 0 0 0 3px rgba(94, 114, 228, 0.1) !important;
-    background: var(--input-bg) !important;
-}
-
-/* Button Styles */
-.stButton > button {
-    background: linear-gradient(135deg, #5e72e4 0%, #667eea 100%);
-    color: white;
-    border: none;
-    border-radius: 12px;
-    padding: 12px 32px;
-    font-weight: 600;
-    font-size: 16px;
-    transition: all 0.3s ease;
-    box-shadow: 0 4px 15px rgba(94, 114, 228, 0.3);
-    position: relative;
-    overflow: hidden;
-}
-
-.stButton > button:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 6px 20px rgba(94, 114, 228, 0.4);
-}
-
-/* Primary Button */
-[data-testid="stButton"] button[kind="primary"] {
-    background: linear-gradient(135deg, #e94560 0%, #ff6b6b 100%);
-    box-shadow: 0 4px 15px rgba(233, 69, 96, 0.3);
-}
-
-/* Download Button */
-.stDownloadButton > button {
-    background: linear-gradient(135deg, #34d399 0%, #10b981 100%);
-    color: white;
-    border: none;
-    border-radius: 12px;
-    padding: 12px 32px;
-    font-weight: 600;
-    transition: all 0.3s ease;
-    box-shadow: 0 4px 15px rgba(52, 211, 153, 0.3);
-}
-
-.stDownloadButton > button:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 6px 20px rgba(52, 211, 153, 0.4);
-}
-
-/* Slider Styles */
-.stSlider > div > div > div > div {
-    background: linear-gradient(90deg, #5e72e4, #e94560) !important;
-}
-
-.stSlider > div > div > div[role="slider"] {
-    background: var(--card-bg) !important;
-    border: 2px solid var(--border-color) !important;
-    box-shadow: 0 2px 10px var(--shadow-medium) !important;
-}
-
-/* Checkbox Styles */
-.stCheckbox label {
-    color: var(--text-primary) !important;
-    font-weight: 500;
-}
-
-/* DataFrame Container */
-.dataframe-container {
-    background: var(--card-bg);
-    border: 1px solid var(--border-color);
-    border-radius: 16px;
-    padding: 20px;
-    backdrop-filter: blur(10px);
-    box-shadow: 0 10px 40px var(--shadow-medium);
-    margin: 20px 0;
-    animation: slideUp 0.6s ease-out;
-}
-
-@keyframes slideUp {
-    from { opacity: 0; transform: translateY(20px); }
-    to { opacity: 1; transform: translateY(0); }
-}
-
-/* Progress Bar */
-.stProgress > div > div > div {
-    background: linear-gradient(90deg, #5e72e4, #e94560, #34d399) !important;
-    background-size: 200% 100%;
-    animation: progressGradient 2s ease infinite;
-    border-radius: 10px;
-    height: 8px !important;
-}
-
-@keyframes progressGradient {
-    0% { background-position: 0% 50%; }
-    100% { background-position: 200% 50%; }
-}
-
-/* Sidebar Styles - Adaptive */
-.css-1d391kg, [data-testid="stSidebar"] {
-    background: var(--sidebar-bg) !important;
-    backdrop-filter: blur(20px);
-    border-right: 1px solid var(--border-color) !important;
-}
-
-.css-1d391kg .stMarkdown, [data-testid="stSidebar"] .stMarkdown {
-    color: var(--text-primary) !important;
-}
-
-/* Metrics Cards - Adaptive */
-.metric-card {
-    background: var(--card-bg-alt);
-    border: 1px solid var(--border-light);
-    border-radius: 16px;
-    padding: 20px;
-    text-align: center;
-    transition: all 0.3s ease;
-    box-shadow: 0 4px 12px var(--shadow-light);
-}
-
-.metric-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 10px 30px var(--shadow-medium);
-}
-
-.metric-value {
-    font-size: 32px;
-    font-weight: 700;
-    background: linear-gradient(135deg, #5e72e4, #e94560);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-}
-
-.metric-label {
-    color: var(--text-secondary);
-    font-size: 14px;
-    font-weight: 500;
-    margin-top: 8px;
-}
-
-/* Text Color Overrides for Consistency */
-.stMarkdown, .stText, p, h1, h2, h3, h4, h5, h6 {
-    color: var(--text-primary) !important;
-}
-
-.stCaption {
-    color: var(--text-secondary) !important;
-}
-
-/* Alert Styles */
-.stAlert {
-    background: var(--card-bg) !important;
-    border: 1px solid var(--border-color) !important;
-    border-radius: 12px !important;
-    color: var(--text-primary) !important;
-    backdrop-filter: blur(10px);
-}
-
-/* Footer */
-.footer-section {
-    margin-top: 60px;
-    padding: 30px;
-    background: var(--card-bg);
-    border-radius: 20px;
-    border: 1px solid var(--border-color);
-    text-align: center;
-    color: var(--text-secondary);
-}
-
-.footer-credit {
-    color: var(--text-secondary);
-    font-size: 14px;
-    font-weight: 400;
-}
-
-.footer-credit a {
-    color: #5e72e4;
-    text-decoration: none;
-    transition: color 0.3s ease;
-}
-
-.footer-credit a:hover {
-    color: #e94560;
-}
-
-/* Custom scrollbar - Adaptive */
-::-webkit-scrollbar {
-    width: 10px;
-    height: 10px;
-}
-
-::-webkit-scrollbar-track {
-    background: var(--card-bg);
-}
-
-::-webkit-scrollbar-thumb {
-    background: linear-gradient(135deg, #5e72e4, #e94560);
-    border-radius: 5px;
-}
-
-::-webkit-scrollbar-thumb:hover {
-    background: linear-gradient(135deg, #e94560, #5e72e4);
-}
-
-/* Tabs - Adaptive */
-.stTabs [data-baseweb="tab-list"] {
-    gap: 8px;
-    background: transparent;
-}
-
-.stTabs [data-baseweb="tab"] {
-    background-color: var(--card-bg) !important;
-    border: 1px solid var(--border-color) !important;
-    border-radius: 8px !important;
-    color: var(--text-primary) !important;
-}
-
-.stTabs [aria-selected="true"] {
-    background-color: var(--input-bg) !important;
-    border-color: #5e72e4 !important;
-    color: var(--text-primary) !important;
-}
-
-/* DataFrame styling */
-[data-testid="stDataFrame"], [data-testid="stTable"] {
-    background: var(--card-bg) !important;
-    color: var(--text-primary) !important;
-}
-
-/* Ensure all text elements use adaptive colors */
-.stSelectbox label, .stSlider label, .stTextArea label, .stTextInput label {
-    color: var(--text-primary) !important;
-}
-
-/* Info/Success/Warning Messages */
-.stInfo, .stSuccess, .stWarning, .stError {
-    background: var(--card-bg) !important;
-    border: 1px solid var(--border-color) !important;
-    color: var(--text-primary) !important;
-}
-
-.stSpinner > div {
-    border-color: #5e72e4 !important;
-}
-
-hr {
-    border: 0;
-    height: 1px;
-    background: var(--border-color);
-    margin: 20px 0;
-}
-</style>
-""", unsafe_allow_html=True)
+    # Adaptive light/dark stylesheet (assets/style.css)
+    st.markdown(_app_css(), unsafe_allow_html=True)
 
   # Hero Section with Enhanced Background Animation
     st.markdown("""
@@ -699,37 +228,13 @@ hr {
     <p class="subtitle">Advanced Research Paper Metadata Extraction & Analysis</p>
 </div>
 """, unsafe_allow_html=True)
-    
-    # Session / networking (UNCHANGED from original)
-    def _get_session() -> requests.Session:
-        s = requests.Session()
-        retries = Retry(
-            total=4,
-            backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=frozenset(["GET"]),
-        )
-        adapter = HTTPAdapter(max_retries=retries, pool_connections=64, pool_maxsize=64)
-        s.mount("https://", adapter)
-        s.mount("http://", adapter)
-        s.headers.update({"User-Agent": "DOI-Navigator/1.1 (mailto:your.email@domain)"})
-        return s
 
+    # Networking
     def _download_excel(url: str) -> io.BytesIO:
         r = _get_session().get(url, timeout=60)
         r.raise_for_status()
         return io.BytesIO(r.content)
 
-    # DOI normalization
-    def normalize_doi_input(s: str) -> str:
-        s = s.strip()
-        low = s.lower()
-        for prefix in ("https://doi.org/", "http://doi.org/", "doi:", "doi "):
-            if low.startswith(prefix):
-                s = s[len(prefix):]
-                break
-        return s.strip()
-
     # Matching config & helpers
     @dataclass
     class MatchCfg:
@@ -737,27 +242,48 @@ hr {
         wos_if_missing: bool = True
         scopus_exact_first: bool = True
 
-    def normalize_journal(s: str) -> str:
-        if not isinstance(s, str):
-            return ""
-        s = s.lower().replace("&", "and")
-        for ch in [",", ".", ":", ";", "(", ")", "[", "]"]:
-            s = s.replace(ch, " ")
-        return " ".join(s.split())
+    @dataclass
+    class JournalIndex:
+        # A reference table plus its normalized names, built once per process
+        df: pd.DataFrame
+        choices: list[str]
+        sorted_choices: list[str]  # choices with tokens pre-sorted for fuzzy scoring
+        keys: pd.Index      # distinct non-empty names
+        rows: np.ndarray    # first row holding each key
+
+        def exact_rows(self, names: list[str]) -> np.ndarray:
+            # One hashtable probe for the whole batch; -1 where there is no hit
+            if not len(self.keys):
+                return np.full(len(names), -1, dtype=np.intp)
+            pos = self.keys.get_indexer(names)
+            return np.where(pos >= 0, self.rows[pos], -1)
+
+    def _sort_tokens(name: str) -> str:
+        # Plain ratio over token-sorted strings is token_sort_ratio without
+        # re-splitting and re-sorting every choice for every query
+        return " ".join(sorted(name.split()))
+
+    def build_index(df: pd.DataFrame) -> JournalIndex:
+        choices = df["__norm"].tolist()
+        sorted_choices = [_sort_tokens(c) for c in choices]
+        # First occurrence wins, matching argmax over the fuzzy scores
+        exact = dict(zip(reversed(choices), range(len(choices) - 1, -1, -1)))
+        exact.pop("", None)
+        keys = pd.Index(list(exact), dtype=object)
+        rows = np.fromiter(exact.values(), dtype=np.intp, count=len(exact))
+        return JournalIndex(df, choices, sorted_choices, keys, rows)
 
     # Readers
     def read_jcr(io_obj) -> pd.DataFrame:
-        xls = pd.ExcelFile(io_obj, engine="openpyxl")
-        df = pd.read_excel(xls, xls.sheet_names[0])
-        if df.shape[1] < 17:
-            raise ValueError("JCR file has fewer than 17 columns; cannot map B/M/Q reliably.")
-        journal_col = df.columns[1]
-        impact_col = df.columns[12]
-        quartile_col = df.columns[16]
-        out = df[[journal_col, impact_col, quartile_col]].copy()
-        out.columns = ["Journal", "Impact Factor", "Quartile"]
-        out["__norm"] = out["Journal"].map(normalize_journal)
-        return out
+        # Only columns B/M/Q are used, so don't let the reader decode the rest
+        try:
+            df = pd.read_excel(io_obj, sheet_name=0, usecols=[1, 12, 16], engine=_EXCEL_ENGINE)
+        except pd.errors.ParserError as e:
+            raise ValueError("JCR file has fewer than 17 columns; cannot map B/M/Q reliably.") from e
+        df.columns = ["Journal", "Impact Factor", "Quartile"]
+        df["Quartile"] = df["Quartile"].astype("category")
+        df["__norm"] = df["Journal"].map(normalize_journal)
+        return df
 
     _SCOPUS_TITLE_LIKELY = {
         "source title", "title", "journal", "publication title", "full title",
@@ -774,66 +300,122 @@ hr {
         return df.columns[0]
 
     def read_scopus_titles(io_obj) -> pd.DataFrame:
-        xls = pd.ExcelFile(io_obj, engine="openpyxl")
-        df = pd.read_excel(xls, xls.sheet_names[0])
-        title_col = _pick_scopus_title_col(df)
-        out = df[[title_col]].copy()
+        # Pick the title column from a short peek, then read only that column
+        head = pd.read_excel(io_obj, sheet_name=0, nrows=5, engine=_EXCEL_ENGINE)
+        pos = head.columns.get_loc(_pick_scopus_title_col(head))
+        io_obj.seek(0)
+        out = pd.read_excel(io_obj, sheet_name=0, usecols=[pos], dtype=str, engine=_EXCEL_ENGINE)
         out.columns = ["Scopus Title"]
         out["__norm"] = out["Scopus Title"].map(normalize_journal)
         return out
 
-    # Cache heavy loads
-    @st.cache_data(show_spinner=True, ttl=60*60*12)
-    def load_jcr_cached(url: str) -> pd.DataFrame:
-        return read_jcr(_download_excel(url))
+    # Cache heavy loads. Parsed tables are written to Parquet (with __norm
+    # already materialized) next to the metadata cache, so a cold start within
+    # the TTL is one columnar read instead of a download plus Excel decode.
+    #
+    # Arrow can't store a column that mixes numbers and text (JCR's Impact
+    # Factor has entries such as "<0.1"), so those columns are written as text,
+    # listed in attrs, and turned back into numbers wherever they parse on read.
+    _MIXED_ATTR = "text_encoded_mixed_columns"
+
+    def _to_parquet_frame(df: pd.DataFrame) -> pd.DataFrame:
+        mixed = [
+            c for c in df.columns
+            if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True).startswith("mixed")
+        ]
+        if not mixed:
+            return df
+        out = df.assign(**{c: df[c].where(df[c].isna(), df[c].astype(str)) for c in mixed})
+        out.attrs[_MIXED_ATTR] = mixed
+        return out
 
-    @st.cache_data(show_spinner=True, ttl=60*60*12)
-    def load_scopus_cached(url: str) -> pd.DataFrame:
-        return read_scopus_titles(_download_excel(url))
+    def _from_parquet_frame(df: pd.DataFrame) -> pd.DataFrame:
+        mixed = df.attrs.pop(_MIXED_ATTR, [])
+        for c in mixed:
+            text = df[c].astype(object)
+            num = pd.to_numeric(text, errors="coerce")
+            df[c] = num.astype(object).where(num.notna(), text)
+        return df
+
+    def _load_table(kind: str, url: str, reader) -> pd.DataFrame:
+        path = os.path.join(_CACHE_DIR, f"{kind}-{hashlib.sha1(url.encode()).hexdigest()[:16]}.parquet")
+        try:
+            if time.time() - os.path.getmtime(path) < _TABLE_TTL:
+                return _from_parquet_frame(pd.read_parquet(path))
+        except OSError:
+            pass
+        df = reader(_download_excel(url))
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            _to_parquet_frame(df).to_parquet(tmp, compression="zstd", index=False)
+            os.replace(tmp, path)
+        except Exception:
+            # Best effort; the next cold start just re-parses the workbook
+            _log.warning("Could not cache %s table as Parquet", kind, exc_info=True)
+        return df
+
+    # The indexed tables are process-wide singletons shared by every session,
+    # so no per-session copy is unpickled; callers must treat them as read-only.
+    # Both workbooks are independent, so they download and parse side by side.
+    @st.cache_resource(show_spinner=True, ttl=_TABLE_TTL)
+    def load_reference_tables(jcr_url: str, scp_url: str) -> tuple[JournalIndex, JournalIndex]:
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            jcr = ex.submit(_load_table, "jcr", jcr_url, read_jcr) if jcr_url else None
+            scp = ex.submit(_load_table, "scopus", scp_url, read_scopus_titles) if scp_url else None
+            jcr_df = jcr.result() if jcr else pd.DataFrame(columns=["Journal", "Impact Factor", "Quartile", "__norm"])
+            scp_df = scp.result() if scp else pd.DataFrame(columns=["Scopus Title", "__norm"])
+        return build_index(jcr_df), build_index(scp_df)
 
     # Metadata fetchers
+    def _crossref_get(url: str, **kwargs) -> requests.Response:
+        # Every Crossref call goes through the breaker. A 404 only means "not
+        # a Crossref DOI", so it counts as a healthy response.
+        breaker = _crossref_breaker()
+        if not breaker.allow():
+            raise RuntimeError("Crossref skipped: too many recent failures")
+        try:
+            r = _get_session().get(url, **kwargs)
+            r.raise_for_status()
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            raise
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return r
+
     def _crossref_fetch_raw(doi: str, timeout: float = 15.0) -> dict:
-        url = f"https://api.crossref.org/works/{doi}"
-        r = _get_session().get(url, timeout=timeout)
-        r.raise_for_status()
-        return r.json().get("message", {})
+        r = _crossref_get(f"https://api.crossref.org/works/{doi}", timeout=timeout)
+        return _json_loads(r.content).get("message", {})
 
     def _doi_content_negotiation(doi: str, timeout: float = 15.0) -> dict:
         url = f"https://doi.org/{doi}"
         headers = {"Accept": "application/vnd.citationstyles.csl+json"}
         r = _get_session().get(url, headers=headers, timeout=timeout, allow_redirects=True)
         r.raise_for_status()
-        return r.json()
+        return _json_loads(r.content)
 
     def _format_authors(msg: dict) -> str:
-        authors = msg.get("author", [])
+        authors = msg.get("author")
+        if not authors or not isinstance(authors, list):
+            return ""
         parts = []
-
-        def fix_initials(s: str) -> str:
-            tokens = s.split()
-            fixed = []
-            for tok in tokens:
-                if len(tok) == 1 and tok.isalpha():
-                    fixed.append(tok + ".")
-                else:
-                    fixed.append(tok)
-            return " ".join(fixed)
-
-        if isinstance(authors, list):
-            for a in authors:
-                if not isinstance(a, dict):
-                    continue
-                given = (a.get("given") or "").strip()
-                family = (a.get("family") or "").strip()
-                literal = (a.get("name") or a.get("literal") or "").strip()
-                if given or family:
-                    given_fixed = fix_initials(given)
-                    name = (given_fixed + " " + family).strip()
-                else:
-                    name = literal
-                if name:
-                    parts.append(name)
-
+        for a in authors:
+            if not isinstance(a, dict):
+                continue
+            given = (a.get("given") or "").strip()
+            family = (a.get("family") or "").strip()
+            if given or family:
+                name = (_INITIAL_RE.sub(r"\1.", given) + " " + family).strip()
+            else:
+                name = (a.get("name") or a.get("literal") or "").strip()
+            if name:
+                parts.append(name)
         return "; ".join(parts)
 
     def _first(x):
@@ -841,25 +423,40 @@ hr {
             return x[0] if x else ""
         return x or ""
 
+    _YEAR_KEYS = ("published-print", "issued", "published-online")
+
+    def _int_or_none(v) -> t.Optional[int]:
+        # CSL records from some registries send numbers as strings ("2019")
+        if isinstance(v, int) and not isinstance(v, bool):
+            return v
+        if isinstance(v, str) and v.strip().isdecimal():
+            return int(v)
+        return None
+
+    def _year_of(msg: dict) -> t.Optional[int]:
+        # First usable date-parts wins; "created" is the last resort
+        for key in _YEAR_KEYS:
+            obj = msg.get(key)
+            if isinstance(obj, dict):
+                parts = obj.get("date-parts")
+                if parts and isinstance(parts[0], list) and parts[0]:
+                    year = _int_or_none(parts[0][0])
+                    if year:
+                        return year
+                    break
+        created = msg.get("created")
+        stamp = created.get("date-time") if isinstance(created, dict) else None
+        if isinstance(stamp, str) and stamp[:4].isdecimal():
+            return int(stamp[:4])
+        return None
+
     def _extract_fields_generic(msg: dict, source: str) -> dict:
         title = _first(msg.get("title"))
         journal = _first(msg.get("container-title"))
         publisher = msg.get("publisher", "") or msg.get("publisher-name", "")
-        year = None
-        for key in ["published-print", "issued", "published-online"]:
-            obj = msg.get(key, {})
-            if isinstance(obj, dict):
-                parts = obj.get("date-parts", [])
-                if parts and isinstance(parts[0], list) and parts[0]:
-                    year = parts[0][0]
-                    break
-        if not year:
-            try:
-                year = int(str(msg.get("created", {}).get("date-time", ""))[:4])
-            except Exception:
-                year = None
+        year = _year_of(msg)
 
-        cites = msg.get("is-referenced-by-count", None) if source == "crossref" else None
+        cites = _int_or_none(msg.get("is-referenced-by-count")) if source == "crossref" else None
 
         return {
             "Title": title,
@@ -870,36 +467,146 @@ hr {
             "Citations (Crossref)": cites,
         }
 
-    @st.cache_data(show_spinner=False, ttl=60*60*24*7)
+    class _Uncached(Exception):
+        # Carries a result out of a cached function without caching it;
+        # st.cache_data never stores a call that raised
+        def __init__(self, data: dict):
+            super().__init__(data.get("error", ""))
+            self.data = data
+
+    # st.cache_data is the in-process L1; the disk store is L2. Neither holds
+    # failed or provisional lookups, so a DOI hit during an outage is retried
+    # on the next fetch instead of staying degraded for the whole TTL.
+    @st.cache_data(show_spinner=False, ttl=60*60*24*7, max_entries=10_000)
+    def _fetch_metadata_cached(doi: str) -> dict:
+        data = _store_get(doi)
+        if data is None:
+            data, final = _fetch_metadata_network(doi)
+            if not final:
+                raise _Uncached(data)
+            _store_put(doi, data)
+        return data
+
     def fetch_metadata_unified(doi: str) -> dict:
         try:
-            msg = _crossref_fetch_raw(doi)
-            data = _extract_fields_generic(msg, source="crossref")
-            if data.get("Title") or data.get("Journal"):
-                return data
-        except Exception:
-            pass
-
+            return _fetch_metadata_cached(doi)
+        except _Uncached as e:
+            return e.data
+
+    # Happy-Eyeballs-style fallback: Crossref gets a short head start, then DOI
+    # content negotiation runs alongside it. DataCite/mEDRA DOIs no longer pay
+    # a full Crossref round-trip first. Crossref's record still wins whenever
+    # it arrives: only it carries citation counts.
+    _CN_HEAD_START = 0.5
+    # How much longer Crossref may take once content negotiation has answered
+    _CROSSREF_GRACE = 5.0
+
+    def _crossref_fields(doi: str) -> t.Optional[dict]:
+        data = _extract_fields_generic(_crossref_fetch_raw(doi), source="crossref")
+        return data if data.get("Title") or data.get("Journal") else None
+
+    def _csl_fields(doi: str) -> t.Optional[dict]:
+        data = _extract_fields_generic(_doi_content_negotiation(doi), source="csl")
+        return data if data.get("Title") or data.get("Journal") else None
+
+    def _ok(fut) -> bool:
+        return fut.done() and fut.exception() is None and bool(fut.result())
+
+    def _ruled_out(fut) -> bool:
+        # Crossref answered that it holds no usable record for this DOI
+        if not fut.done():
+            return False
+        e = fut.exception()
+        if e is None:
+            return not fut.result()
+        return isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code == 404
+
+    def _fetch_metadata_network(doi: str) -> tuple[dict, bool]:
+        # Returns (data, final). A content-negotiation answer is final only once
+        # Crossref has ruled the DOI out; if Crossref was slow, failing or
+        # skipped by the breaker, the row is shown but must not be cached.
+        racer = ThreadPoolExecutor(max_workers=2)
         try:
-            csl = _doi_content_negotiation(doi)
-            data = _extract_fields_generic(csl, source="csl")
+            crossref = None
+            if _crossref_breaker().allow():
+                crossref = racer.submit(_crossref_fields, doi)
+                wait({crossref}, timeout=_CN_HEAD_START)
+                if _ok(crossref):
+                    return crossref.result(), True
+            cn = racer.submit(_csl_fields, doi)
+            pending = {cn} if crossref is None or crossref.done() else {crossref, cn}
+            while cn in pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if crossref in done and _ok(crossref):
+                    return crossref.result(), True
+            if crossref is not None and not crossref.done():
+                wait({crossref}, timeout=_CROSSREF_GRACE)
+                if _ok(crossref):
+                    return crossref.result(), True
+            if _ok(cn):
+                return cn.result(), crossref is not None and _ruled_out(crossref)
+            if cn.exception() is not None:
+                return {"error": f"Not found via Crossref; DOI content negotiation also failed: {cn.exception()}"}, False
+            return {"error": "Metadata not available from Crossref or DOI content negotiation."}, False
+        finally:
+            racer.shutdown(wait=False, cancel_futures=True)
+
+    # Crossref's filter endpoint resolves many DOIs per round-trip
+    _CROSSREF_BATCH = 20
+
+    @st.cache_data(show_spinner=False, ttl=60*60*24*7, max_entries=1_000)
+    def _crossref_fetch_batch(dois: tuple[str, ...], timeout: float = 30.0) -> dict[str, dict]:
+        params = {"filter": ",".join(f"doi:{d}" for d in dois), "rows": len(dois)}
+        r = _crossref_get("https://api.crossref.org/works", params=params, timeout=timeout)
+        found = {}
+        for msg in _json_loads(r.content).get("message", {}).get("items", []):
+            data = _extract_fields_generic(msg, source="crossref")
             if data.get("Title") or data.get("Journal"):
-                return data
-        except Exception as e:
-            return {"error": f"Not found via Crossref; DOI content negotiation also failed: {e}"}
-
-        return {"error": "Metadata not available from Crossref or DOI content negotiation."}
+                found[str(msg.get("DOI", "")).lower()] = data
+        return found
 
     def fetch_parallel(dois: list[str], max_workers: int = 12) -> list[dict]:
-        order = {d: i for i, d in enumerate(dois)}
-        entries: list[dict] = []
+        # One slot per input DOI, filled as results land, so paste order holds
+        entries: list[t.Optional[dict]] = [None] * len(dois)
         with ThreadPoolExecutor(max_workers=min(max_workers, max(1, len(dois)))) as ex:
-            futs = {ex.submit(fetch_metadata_unified, d): d for d in dois}
-            total, done = len(futs), 0
+            total, done = len(dois), 0
+            # Each progress update is a websocket frame; cap them at ~100 per fetch
+            step = max(1, total // 100)
             progress = st.progress(0.0, text="Initializing...")
             with st.spinner("🔍 Fetching metadata with universal DOI fallback..."):
+                # Batched Crossref pass first (a comma would split the filter,
+                # so those DOIs only take the per-DOI path)
+                found: dict[str, dict] = {}
+                for doi in dois:
+                    data = _store_get(doi)
+                    if data is not None:
+                        found[doi.lower()] = data
+                batchable = [d for d in dois if "," not in d and d.lower() not in found]
+                batch_futs = [
+                    ex.submit(_crossref_fetch_batch, tuple(batchable[i:i + _CROSSREF_BATCH]))
+                    for i in range(0, len(batchable), _CROSSREF_BATCH)
+                ]
+                for fut in as_completed(batch_futs):
+                    try:
+                        batch = fut.result()
+                    except Exception:
+                        continue
+                    for doi, data in batch.items():
+                        _store_put(doi, data)
+                    found.update(batch)
+                for i, doi in enumerate(dois):
+                    data = found.get(doi.lower())
+                    if data is not None:
+                        entries[i] = {"DOI": doi, **data}
+                        done += 1
+                if done:
+                    progress.progress(done / total, text=f"Processing {done}/{total} papers...")
+
+                # Whatever the batches missed: Crossref per DOI, then content negotiation
+                futs = {ex.submit(fetch_metadata_unified, d): i for i, d in enumerate(dois) if d.lower() not in found}
                 for fut in as_completed(futs):
-                    doi = futs[fut]
+                    i = futs[fut]
+                    doi = dois[i]
                     data = fut.result()
                     if "error" in data:
                         entry = {
@@ -913,83 +620,115 @@ hr {
                         }
                     else:
                         entry = {"DOI": doi, **data}
-                    entries.append(entry)
+                    entries[i] = entry
                     done += 1
-                    progress.progress(done / total, text=f"Processing {done}/{total} papers...")
+                    if done % step == 0 or done == total:
+                        progress.progress(done / total, text=f"Processing {done}/{total} papers...")
             progress.empty()
-        entries.sort(key=lambda e: order.get(e["DOI"], 10**9))
         return entries
 
     # Batch merge with RapidFuzz
-    def merge_enrich_fast(df: pd.DataFrame, jcr: pd.DataFrame, scopus: pd.DataFrame, cfg: MatchCfg) -> pd.DataFrame:
+    _CDIST_TILE = 512
+
+    def _best_matches(queries: list[str], choices: list[str], min_score: int) -> tuple[np.ndarray, np.ndarray]:
+        # Score the queries in tiles so the uint8 matrix stays at tile x choices
+        # instead of len(queries) x choices for very large batches. Both sides
+        # are token-sorted, so order is ignored ("X Journal" vs "Journal of X");
+        # token subsets are not.
+        # A batch often repeats the same unmatched journal, so each distinct
+        # name is scored once and the result broadcast back to its rows.
+        slot: dict[str, int] = {}
+        inverse = np.fromiter((slot.setdefault(name, len(slot)) for name in queries), dtype=np.intp, count=len(queries))
+        uniq = [_sort_tokens(name) for name in slot]
+        best_idx = np.zeros(len(uniq), dtype=np.intp)
+        best_scr = np.zeros(len(uniq), dtype=np.uint8)
+        for start in range(0, len(uniq), _CDIST_TILE):
+            stop = start + _CDIST_TILE
+            scores = process.cdist(
+                uniq[start:stop], choices, scorer=fuzz.ratio, processor=None,
+                score_cutoff=min_score, dtype=np.uint8, workers=-1,
+            )
+            # One pass finds the argmax; the score is then a gather, not a second scan
+            idx = scores.argmax(axis=1)
+            best_idx[start:stop] = idx
+            best_scr[start:stop] = np.take_along_axis(scores, idx[:, None], axis=1)[:, 0]
+        return best_idx[inverse], best_scr[inverse]
+
+    def merge_enrich_fast(df: pd.DataFrame, jcr: JournalIndex, scopus: JournalIndex, cfg: MatchCfg) -> pd.DataFrame:
         if df.empty:
             return df
-        q = df["Journal"].fillna("").astype(str).map(normalize_journal).tolist()
-
-        imp = [None] * len(q)
-        qrt = [None] * len(q)
-        wos = [False if cfg.wos_if_missing else None] * len(q)
-
-        if not jcr.empty:
-            j_choices = jcr["__norm"].tolist()
-            if _USE_RAPIDFUZZ and q and j_choices:
-                scores = process.cdist(q, j_choices, scorer=fuzz.WRatio, workers=-1)
-                best_idx = scores.argmax(axis=1)
-                best_scr = scores.max(axis=1)
-                for i, s in enumerate(best_scr):
-                    if s >= cfg.min_score:
-                        row = jcr.iloc[best_idx[i]]
-                        imp[i] = row["Impact Factor"]
-                        qrt[i] = row["Quartile"]
-                        if cfg.wos_if_missing:
-                            wos[i] = True
-            else:
-                for i, name in enumerate(q):
-                    if not name:
-                        continue
-                    match = difflib.get_close_matches(name, j_choices, n=1, cutoff=0.0)
-                    if match:
-                        score = int(100 * difflib.SequenceMatcher(None, name, match[0]).ratio())
-                        if score >= cfg.min_score:
-                            row = jcr.iloc[j_choices.index(match[0])]
-                            imp[i] = row["Impact Factor"]
-                            qrt[i] = row["Quartile"]
-                            if cfg.wos_if_missing:
-                                wos[i] = True
-
-        scp = [False] * len(q)
-        if not scopus.empty:
-            s_choices = scopus["__norm"].tolist()
-            s_set = set(s_choices) if cfg.scopus_exact_first else set()
-            for i, name in enumerate(q):
-                if cfg.scopus_exact_first and name in s_set:
-                    scp[i] = True
-            if _USE_RAPIDFUZZ and q and s_choices:
-                need = [i for i, v in enumerate(scp) if not v]
-                if need:
-                    qs = [q[i] for i in need]
-                    scores = process.cdist(qs, s_choices, scorer=fuzz.WRatio, workers=-1)
-                    best_scr = scores.max(axis=1)
-                    for k, s in enumerate(best_scr):
-                        if s >= cfg.min_score:
-                            scp[need[k]] = True
-            else:
-                for i, name in enumerate(q):
-                    if scp[i]:
-                        continue
-                    match = difflib.get_close_matches(name, s_choices, n=1, cutoff=0.0)
-                    if match:
-                        score = int(100 * difflib.SequenceMatcher(None, name, match[0]).ratio())
-                        if score >= cfg.min_score:
-                            scp[i] = True
+        # Normalize each distinct journal once, then broadcast back to the rows
+        journals = df["Journal"].fillna("").astype(str)
+        q_norm = {j: normalize_journal(j) for j in pd.unique(journals)}
+        q = journals.map(q_norm).tolist()
+
+        n = len(q)
+        nonempty = np.array([bool(name) for name in q], dtype=bool)
+
+        # Output columns are preallocated and filled by mask, never appended to
+        imp = np.full(n, None, dtype=object)
+        qrt = np.full(n, None, dtype=object)
+        hit = np.full(n, -1, dtype=np.intp)
+        if not jcr.df.empty:
+            hit = jcr.exact_rows(q)
+            need = np.flatnonzero((hit < 0) & nonempty)
+            if need.size and jcr.choices:
+                best_idx, best_scr = _best_matches([q[i] for i in need], jcr.sorted_choices, cfg.min_score)
+                ok = best_scr >= cfg.min_score
+                hit[need[ok]] = best_idx[ok]
+            # Gather every hit's JCR fields in one take instead of a Series per row
+            matched = hit >= 0
+            if matched.any():
+                imp[matched] = jcr.df["Impact Factor"].take(hit[matched]).to_numpy(dtype=object)
+                qrt[matched] = jcr.df["Quartile"].take(hit[matched]).to_numpy(dtype=object)
+        if cfg.wos_if_missing:
+            wos = pd.array(hit >= 0, dtype="boolean")
+        else:
+            wos = pd.array([pd.NA] * n, dtype="boolean")
+
+        scp = np.zeros(n, dtype=bool)
+        if not scopus.df.empty:
+            if cfg.scopus_exact_first:
+                # Scopus only answers yes/no, so try hash probes before cdist:
+                # the query itself, then the canonical JCR title it matched
+                scp = scopus.exact_rows(q) >= 0
+                via_jcr = (hit >= 0) & ~scp
+                if via_jcr.any():
+                    scp[via_jcr] = scopus.exact_rows([jcr.choices[h] for h in hit[via_jcr]]) >= 0
+            need = np.flatnonzero(~scp & nonempty)
+            if need.size and scopus.choices:
+                _, best_scr = _best_matches([q[i] for i in need], scopus.sorted_choices, cfg.min_score)
+                scp[need[best_scr >= cfg.min_score]] = True
 
         out = df.copy()
-        out["Impact Factor (JCR)"] = imp
-        out["Quartile (JCR)"] = qrt
+        try:
+            out["Impact Factor (JCR)"] = pd.to_numeric(pd.Series(imp, index=out.index, dtype=object))
+        except (TypeError, ValueError):
+            out["Impact Factor (JCR)"] = imp  # keep text entries such as "<0.1" as-is
+        out["Quartile (JCR)"] = pd.Categorical(qrt)
         out["Indexed in Scopus"] = scp
         out["Indexed in Web of Science"] = wos
         return out
 
+    # Export: a write-only workbook streams rows instead of building a cell
+    # graph; cached so reruns with the same results skip the rebuild
+    @st.cache_data(show_spinner=False, max_entries=16)
+    def to_xlsx_bytes(df: pd.DataFrame, sheet_name: str = "DOI Metadata") -> bytes:
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_name)
+        header = []
+        for name in [df.index.name or ""] + list(df.columns):
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        ws.append(header)
+        body = df.astype(object).where(df.notna(), None)
+        for idx, row in zip(body.index, body.itertuples(index=False, name=None)):
+            ws.append((idx,) + row)
+        buf = io.BytesIO()
+        wb.save(buf)
+        return buf.getvalue()
+
     # Sidebar with Enhanced UI
     with st.sidebar:
         st.markdown('<h2 style="color: var(--text-primary); margin-bottom: 20px;">⚙️ Configuration</h2>', unsafe_allow_html=True)
@@ -1035,21 +774,29 @@ hr {
     with col1:
         fetch = st.button("🚀 Fetch Metadata", type="primary", use_container_width=True)
     with col2:
+        # State is cleared before the results block reads it, so the rest of
+        # this run already renders the empty page; no second run is needed
         if st.button("🗑️ Clear All", use_container_width=True):
-            if 'jcr_df' in st.session_state:
-                del st.session_state.jcr_df
-            if 'sc_df' in st.session_state:
-                del st.session_state.sc_df
-            st.rerun()
+            for key in ("jcr_idx", "sc_idx", "results_df"):
+                st.session_state.pop(key, None)
     with col3:
         raw_lines = [d for d in dois_text.splitlines() if d.strip()]
-        dois = list(dict.fromkeys(normalize_doi_input(d) for d in raw_lines))
+        dois, skipped = [], []
+        for d in dict.fromkeys(normalize_doi_input(d) for d in raw_lines):
+            (dois if _DOI_RE.fullmatch(d) else skipped).append(d)
         st.markdown(f'<div class="metric-card"><div class="metric-value">{len(dois)}</div><div class="metric-label">DOIs</div></div>', unsafe_allow_html=True)
+    if skipped:
+        preview = ", ".join(skipped[:5]) + (", ..." if len(skipped) > 5 else "")
+        st.warning(f"⚠️ Skipping {len(skipped)} line(s) that don't look like DOIs: {preview}")
     st.markdown('<hr>', unsafe_allow_html=True)
 
-    results_df = None
+    # Results outlive reruns triggered by other widgets; only Fetch replaces them
+    results_df = st.session_state.get("results_df")
+
+    def load_jcr_and_scopus() -> tuple[JournalIndex, JournalIndex]:
+        if 'jcr_idx' in st.session_state and 'sc_idx' in st.session_state:
+            return st.session_state.jcr_idx, st.session_state.sc_idx
 
-    def load_jcr_and_scopus():
         jcr_url = JCR_FALLBACK_URL
         scp_url = SCOPUS_FALLBACK_URL
         
@@ -1059,26 +806,15 @@ hr {
             status = st.empty()
             
             try:
-                status.text("Loading JCR database...")
-                progress_bar.progress(25)
-                jcr = load_jcr_cached(jcr_url) if jcr_url else pd.DataFrame(
-                    columns=["Journal", "Impact Factor", "Quartile", "__norm"]
-                )
-                
-                status.text("Loading Scopus database...")
-                progress_bar.progress(75)
-                scp = load_scopus_cached(scp_url) if scp_url else pd.DataFrame(
-                    columns=["Scopus Title", "__norm"]
-                )
+                status.text("Loading JCR and Scopus databases...")
+                progress_bar.progress(50)
+                jcr, scp = load_reference_tables(jcr_url, scp_url)
                 
                 progress_bar.progress(100)
                 status.success("✅ Databases loaded successfully!")
                 
-                st.session_state.jcr_df = jcr
-                st.session_state.sc_df = scp
-                
-                import time
-                time.sleep(1)
+                st.session_state.jcr_idx = jcr
+                st.session_state.sc_idx = scp
                 
             finally:
                 progress_bar.empty()
@@ -1090,88 +826,88 @@ hr {
         if len(dois) == 0:
             st.error("⚠️ Please enter at least one DOI to proceed.")
         else:
-            jcr_df, sc_df = load_jcr_and_scopus()
+            jcr_idx, sc_idx = load_jcr_and_scopus()
             
             st.markdown('<h3 style="color: var(--text-primary);">🔍 Fetching Metadata</h3>', unsafe_allow_html=True)
             
             rows = fetch_parallel(dois, max_workers=fast_workers)
-            base_df = pd.DataFrame(rows)
+            # Year and citation counts stay integers; gaps would otherwise
+            # turn both columns into float64. Coercing first keeps a stray
+            # non-integer (e.g. a record cached by an older build) from
+            # failing the whole table.
+            base_df = pd.DataFrame.from_records(rows)
             
             if not base_df.empty:
+                for col, dtype in (("Year", "Int32"), ("Citations (Crossref)", "Int64")):
+                    num = pd.to_numeric(base_df[col], errors="coerce")
+                    base_df[col] = num.where(num % 1 == 0).astype(dtype)
                 with st.spinner("📄 Matching with JCR and Scopus databases..."):
-                    results_df = merge_enrich_fast(base_df, jcr_df, sc_df, cfg)
+                    results_df = merge_enrich_fast(base_df, jcr_idx, sc_idx, cfg)
                 st.success(f"✅ Successfully processed {len(results_df)} papers!")
+                st.session_state.results_df = results_df
             st.markdown('<hr>', unsafe_allow_html=True)
 
     # Display & Download
+    _PAGE_SIZE = 100
     if results_df is not None and not results_df.empty:
         results_df.index = pd.RangeIndex(start=1, stop=len(results_df) + 1, name="S.No.")
         
         st.markdown('<h3 style="color: var(--text-primary);">📊 Analysis Summary</h3>', unsafe_allow_html=True)
         
-        col1, col2, col3, col4 = st.columns(4)
-        
         total_papers = len(results_df)
         wos_count = results_df["Indexed in Web of Science"].sum()
         scopus_count = results_df["Indexed in Scopus"].sum()
         q1_count = (results_df["Quartile (JCR)"] == "Q1").sum()
-        
-        with col1:
-            st.markdown(f'''
-            <div class="metric-card">
-                <div class="metric-value">{total_papers}</div>
-                <div class="metric-label">Total Papers</div>
-            </div>
-            ''', unsafe_allow_html=True)
-        
-        with col2:
-            wos_pct = (wos_count/total_papers*100) if total_papers > 0 else 0
-            st.markdown(f'''
-            <div class="metric-card">
-                <div class="metric-value">{wos_count}</div>
-                <div class="metric-label">WoS Indexed ({wos_pct:.1f}%)</div>
-            </div>
-            ''', unsafe_allow_html=True)
-        
-        with col3:
-            scopus_pct = (scopus_count/total_papers*100) if total_papers > 0 else 0
-            st.markdown(f'''
-            <div class="metric-card">
-                <div class="metric-value">{scopus_count}</div>
-                <div class="metric-label">Scopus Indexed ({scopus_pct:.1f}%)</div>
-            </div>
-            ''', unsafe_allow_html=True)
-        
-        with col4:
-            q1_pct = (q1_count/total_papers*100) if total_papers > 0 else 0
-            st.markdown(f'''
-            <div class="metric-card">
-                <div class="metric-value">{q1_count}</div>
-                <div class="metric-label">Q1 Papers ({q1_pct:.1f}%)</div>
-            </div>
-            ''', unsafe_allow_html=True)
+
+        def pct(count) -> float:
+            return (count/total_papers*100) if total_papers > 0 else 0
+
+        # The four cards go out as one element; the grid wraps on narrow
+        # screens the way st.columns would
+        cards = "".join(
+            f'<div class="metric-card"><div class="metric-value">{value}</div>'
+            f'<div class="metric-label">{label}</div></div>'
+            for value, label in (
+                (total_papers, "Total Papers"),
+                (wos_count, f"WoS Indexed ({pct(wos_count):.1f}%)"),
+                (scopus_count, f"Scopus Indexed ({pct(scopus_count):.1f}%)"),
+                (q1_count, f"Q1 Papers ({pct(q1_count):.1f}%)"),
+            )
+        )
+        st.markdown(
+            '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 1rem;">'
+            f'{cards}</div>',
+            unsafe_allow_html=True,
+        )
         st.markdown('<hr>', unsafe_allow_html=True)
         
         # Results Table
         st.markdown('<h3 style="color: var(--text-primary);">🔓 Results Table</h3>', unsafe_allow_html=True)
         
-        disp = results_df.copy()
+        # Only one page of rows is serialized to the browser; export keeps all
+        pages = -(-len(results_df) // _PAGE_SIZE)
+        page = 1
+        if pages > 1:
+            page = st.number_input(f"Page (1–{pages}, {_PAGE_SIZE} rows each)", min_value=1, max_value=pages, value=1, step=1)
+        shown = results_df.iloc[(page - 1) * _PAGE_SIZE:page * _PAGE_SIZE]
         
-        def yn_to_emoji(v):
-            if v is True:
-                return "✅ Yes"
-            if v is False:
-                return "❌ No"
-            return "➖ N/A"
+        # Label whole columns at once: booleans via np.where, quartiles per category
+        def yn_labels(col: pd.Series, yes: str, no: str, na: str) -> np.ndarray:
+            b = col.astype("boolean")
+            return np.where(b.isna(), na, np.where(b.fillna(False), yes, no))
         
         def format_quartile(v):
             if pd.isna(v) or v == "":
                 return "➖"
             return f"🏆 {v}" if v == "Q1" else f"📊 {v}"
         
-        disp["Indexed in Scopus"] = disp["Indexed in Scopus"].map(yn_to_emoji)
-        disp["Indexed in Web of Science"] = disp["Indexed in Web of Science"].map(yn_to_emoji)
-        disp["Quartile (JCR)"] = disp["Quartile (JCR)"].map(format_quartile)
+        # assign() swaps in the three relabelled columns and shares the rest
+        q = shown["Quartile (JCR)"].astype("category")
+        disp = shown.assign(**{
+            "Indexed in Scopus": yn_labels(shown["Indexed in Scopus"], "✅ Yes", "❌ No", "➖ N/A"),
+            "Indexed in Web of Science": yn_labels(shown["Indexed in Web of Science"], "✅ Yes", "❌ No", "➖ N/A"),
+            "Quartile (JCR)": q.map({c: format_quartile(c) for c in q.cat.categories}).astype(object).fillna("➖"),
+        })
         
         st.dataframe(
             disp, 
@@ -1192,26 +928,20 @@ hr {
         # Download Section
         st.markdown('<h3 style="color: var(--text-primary);">💾 Export Options</h3>', unsafe_allow_html=True)
         
-        export_df = results_df.copy()
-        export_df["Indexed in Scopus"] = export_df["Indexed in Scopus"].map(
-            lambda v: "Yes" if v is True else "No" if v is False else ""
-        )
-        export_df["Indexed in Web of Science"] = export_df["Indexed in Web of Science"].map(
-            lambda v: "Yes" if v is True else "No" if v is False else ""
-        )
+        export_df = results_df.assign(**{
+            "Indexed in Scopus": yn_labels(results_df["Indexed in Scopus"], "Yes", "No", ""),
+            "Indexed in Web of Science": yn_labels(results_df["Indexed in Web of Science"], "Yes", "No", ""),
+        })
         
-        from io import BytesIO
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            export_df.to_excel(writer, index=True, sheet_name='DOI Metadata')
-        excel_data = output.getvalue()
+        excel_data = to_xlsx_bytes(export_df)
         
         st.download_button(
             "📊 Download as Excel",
             excel_data,
             "doi_metadata.xlsx",
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True
+            use_container_width=True,
+            on_click="ignore",
         )
         st.markdown('<hr>', unsafe_allow_html=True)
 